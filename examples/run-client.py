@@ -2,7 +2,7 @@
 
 import missioncommander
 
-import time
+import threading
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
@@ -10,14 +10,14 @@ client = missioncommander.Client()
 client.address = '127.0.0.1'
 client.port = 30000
 client.client_id = client.generate_new_id()
-should_run = True
+stop = threading.Event()
 
 def on_msg(msg: missioncommander.Message):
     print("got message: ", msg.payload)
 
 def on_shutdown():
     print("server shutting down")
-    should_run = False
+    stop.set()
 
 client.subscribe('message', on_msg)
 client.subscribe('servershutdown', on_shutdown)
@@ -25,10 +25,10 @@ client.connect()
 
 print("Ready")
 
-while should_run:
-    try: time.sleep(1)
-    except KeyboardInterrupt:
-        should_run = False
+try: stop.wait()
+except KeyboardInterrupt:
+    stop.set()
 
-if client.state & missioncommander.ClientState.STATE_CONNECTED:
+# (also while reconnecting, to cancel it; its thread would keep us alive)
+if not (client.state & missioncommander.ClientState.STATE_NOT_CONNECTED):
     client.disconnect()
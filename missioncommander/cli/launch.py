@@ -1,14 +1,13 @@
 import shlex
-import logging
 
-from typing import Dict, Any, List, Tuple, Union
+from typing import Dict, Any, List, Tuple, Union, Callable
 
 from missioncommander.client import Client
 from missioncommander.server import Server
 
 # make logger for this module
 import logging
-logging.getLogger('missioncommander.gui')
+logging.getLogger('missioncommander.cli')
 
 
 class CommandReturn:
@@ -50,17 +49,43 @@ class CommandReturn:
     MISSING_REQUIRED_VAR = BAD_CMD | MISSING_VAR
     """ A required variable was not found. """
 
-    # helper func
-    @classmethod
-    def _ok_check_length(cls, length: int, cmd: List[str]):
-        return cls.RAN_OK if len(cmd) == length else cls.IGNORED_VAR
+
+# helper funcs
+def _ok_check_length(length: int, cmd: List[str]) -> int:
+    return CommandReturn.RAN_OK if len(cmd) == length else CommandReturn.IGNORED_VAR
+
+def _split_command(line: str) -> List[str]:
+    # shlex is only needed for quoting and escapes; plain lines split on whitespace
+    if '"' in line or "'" in line or '\\' in line:
+        return shlex.split(line)
+    return line.split()
 
 
 class ControllerCLI:
+    __slots__ = ('server', 'client', '__should_run', '__handlers')
+
     def __init__(self):
-        self.server = Server()
-        self.client = Client()
-        self.__should_run = False
+        self.server: Server = Server()
+        self.client: Client = Client()
+        self.__should_run: bool = False
+        # verb handlers, keyed by (controller, verb)
+        self.__handlers: Dict[Tuple[str, str], Callable[[List[str]], Tuple[CommandReturn, str]]] = {
+            ('client', 'set'):        self.__client_set,
+            ('client', 'get'):        self.__client_get,
+            ('client', 'start'):      self.__start,
+            ('client', 'stop'):       self.__stop,
+            ('client', 'status'):     self.__status,
+            ('client', 'connect'):    self.__client_connect,
+            ('client', 'disconnect'): self.__client_disconnect,
+            ('client', 'help'):       self.__client_help,
+            ('server', 'set'):        self.__server_set,
+            ('server', 'get'):        self.__server_get,
+            ('server', 'start'):      self.__start,
+            ('server', 'stop'):       self.__stop,
+            ('server', 'status'):     self.__status,
+            ('server', 'send'):       self.__server_send,
+            ('server', 'help'):       self.__server_help,
+        }
     
 
     def setup(self, args: Dict[str, Any]) -> None:
@@ -74,111 +99,127 @@ class ControllerCLI:
         
         if cmd[0] in ['quit', 'exit']:
             self.__should_run = False
-            return (CommandReturn._ok_check_length(1, cmd), "Exiting")
+            return (_ok_check_length(1, cmd), "Exiting")
         
         if cmd[0] == 'help':
-            return (CommandReturn._ok_check_length(1, cmd), "Command syntax:  {client/server} <verb> [args...]")
+            return (_ok_check_length(1, cmd), "Command syntax:  {client/server} <verb> [args...]")
 
         # make sure interface is OK
         if cmd[0] not in ['client', 'server']:
             return (CommandReturn.BAD_CMD, f"Unknown controller '{cmd[0]}'")
-        is_client = (cmd[0] == 'client')  # helper
         
         # make sure there's a verb
         if len(cmd) == 1:
             return (CommandReturn.MISSING_REQUIRED_VAR, f"{cmd[0]}: No verb specified")
         verb = cmd[1].lower()
         
-        if verb == 'set':
-            # make sure there's a field
-            if len(cmd) == 2:
-                return (CommandReturn.MISSING_REQUIRED_VAR, f"{cmd[0]}: set: No field specified")
-            field = cmd[2].lower()
-            # make sure field is valid
-            if not ((is_client and field in ['address', 'port', 'client_id']) or (not is_client and field in ['interface', 'port'])):
-                return (CommandReturn.BAD_VAR_TYPE, f"{cmd[0]}: set: Unknown field {field}")
-            # make sure there's a value
-            if len(cmd) == 3:
-                return (CommandReturn.MISSING_REQUIRED_VAR, f"{cmd[0]}: set {field}: No value specified")
-            state = cmd[3].lower()
-            # is field port?
-            if field == 'port':
-                # check type
-                try:
-                    state = int(state)
-                except ValueError:
-                    return (CommandReturn.BAD_VAR_TYPE, f"{cmd[0]}: set port: {state} is not a valid integer")
-                else:
-                    if is_client:  self.client.port = state
-                    else:          self.server.port = state
-                    return (CommandReturn._ok_check_length(4, cmd), f"Set {cmd[0]} field port to {state}")
-            # is field client.address?
-            if field == 'address':
-                self.client.address = state
-                return (CommandReturn._ok_check_length(4, cmd), f"Set client field address to {state}")
-            # is field client.client_id?
-            if field == 'client_id':
-                self.client.client_id = state
-                return (CommandReturn._ok_check_length(4, cmd), f"Set client field client_id to {state}")
-            # is field server.interface?
-            if field == 'interface':
-                self.server.interface = state
-                return (CommandReturn._ok_check_length(4, cmd), f"Set server field interface to {state}")
-        
-        if verb == 'get':
-            # make sure there's a field
-            if len(cmd) == 2:
-                return (CommandReturn.MISSING_REQUIRED_VAR, f"{cmd[0]}: get: No field specified")
-            field = cmd[2].lower()
-            # make sure field is valid
-            if not ((field == 'port') or (is_client and field == 'address') or (not is_client and field == 'interface')):
-                return (CommandReturn.BAD_VAR_TYPE, f"{cmd[0]}: get: Unknown field {field}")
-            # is field port?
-            if field == 'port':
-                if is_client:  return (CommandReturn._ok_check_length(3, cmd), str(self.client.port))
-                else:          return (CommandReturn._ok_check_length(3, cmd), str(self.server.port))
-            # is field client.address?
-            if field == 'address':
-                return (CommandReturn._ok_check_length(3, cmd), str(self.client.address))
-            # is field server.interface?
-            if field == 'interface':
-                return (CommandReturn._ok_check_length(3, cmd), str(self.server.interface))
-        
-        if verb == 'start':
-            if is_client: self.client.start()
-            else:         self.server.start()
-            return (CommandReturn._ok_check_length(2, cmd), f"{cmd[0]}: Started")
-                
-        if verb == 'stop':
-            if is_client:  self.client.stop()
-            else:          self.server.stop()
-            return (CommandReturn._ok_check_length(2, cmd), f"{cmd[0]}: Stopped")
-        
-        if verb == 'status':
-            if is_client:  return (CommandReturn._ok_check_length(2, cmd), str(self.client.status))
-            else:          return (CommandReturn._ok_check_length(2, cmd), str(self.server.status))
-        
-        if is_client and verb == 'connect':
-            self.client.connect()
-            return (CommandReturn._ok_check_length(2, cmd), "client: Connected")
-        
-        if is_client and verb == 'disconnect':
-            self.client.disconnect()
-            return (CommandReturn._ok_check_length(2, cmd), "client: Disconnected")
-        
-        if not is_client and verb == 'send':
-            self.server.send(cmd[2])
-            return (CommandReturn._ok_check_length(3, cmd), f"server: Sent message {shlex.quote(cmd[2])}")
-        
-        if verb == 'help':
-            if is_client:  return (CommandReturn._ok_check_length(2, cmd), "client: Known verbs: set, get, connect, disconnect, start, stop, status")
-            else:          return (CommandReturn._ok_check_length(2, cmd), "server: Known verbs: set, get, start, stop, status, send")
-        
-        if verb == 'status':
-            if is_client:  return(CommandReturn._ok_check_length(2, cmd), str(self.client.status))
-            else:          return(CommandReturn._ok_check_length(2, cmd), str(self.server.status))
-        
-        return (CommandReturn.BAD_CMD, f"{cmd[0]}: Unknown verb {verb}")
+        handler = self.__handlers.get((cmd[0], verb))
+        if handler is None:
+            return (CommandReturn.BAD_CMD, f"{cmd[0]}: Unknown verb {verb}")
+        return handler(cmd)
+
+
+    def __client_set(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        # make sure there's a field
+        if len(cmd) == 2:
+            return (CommandReturn.MISSING_REQUIRED_VAR, "client: set: No field specified")
+        field = cmd[2].lower()
+        # make sure field is valid
+        if field not in ['address', 'port', 'client_id']:
+            return (CommandReturn.BAD_VAR_TYPE, f"client: set: Unknown field {field}")
+        # make sure there's a value
+        if len(cmd) == 3:
+            return (CommandReturn.MISSING_REQUIRED_VAR, f"client: set {field}: No value specified")
+        state = cmd[3].lower()
+        if field == 'port':
+            # check type
+            try:
+                state = int(state)
+            except ValueError:
+                return (CommandReturn.BAD_VAR_TYPE, f"client: set port: {state} is not a valid integer")
+            self.client.port = state
+        elif field == 'address':
+            self.client.address = state
+        elif field == 'client_id':
+            self.client.client_id = state
+        return (_ok_check_length(4, cmd), f"Set client field {field} to {state}")
+
+    def __server_set(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        # make sure there's a field
+        if len(cmd) == 2:
+            return (CommandReturn.MISSING_REQUIRED_VAR, "server: set: No field specified")
+        field = cmd[2].lower()
+        # make sure field is valid
+        if field not in ['interface', 'port']:
+            return (CommandReturn.BAD_VAR_TYPE, f"server: set: Unknown field {field}")
+        # make sure there's a value
+        if len(cmd) == 3:
+            return (CommandReturn.MISSING_REQUIRED_VAR, f"server: set {field}: No value specified")
+        state = cmd[3].lower()
+        if field == 'port':
+            # check type
+            try:
+                state = int(state)
+            except ValueError:
+                return (CommandReturn.BAD_VAR_TYPE, f"server: set port: {state} is not a valid integer")
+            self.server.port = state
+        elif field == 'interface':
+            self.server.interface = state
+        return (_ok_check_length(4, cmd), f"Set server field {field} to {state}")
+
+    def __client_get(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        # make sure there's a field
+        if len(cmd) == 2:
+            return (CommandReturn.MISSING_REQUIRED_VAR, "client: get: No field specified")
+        field = cmd[2].lower()
+        if field == 'port':
+            return (_ok_check_length(3, cmd), str(self.client.port))
+        if field == 'address':
+            return (_ok_check_length(3, cmd), str(self.client.address))
+        return (CommandReturn.BAD_VAR_TYPE, f"client: get: Unknown field {field}")
+
+    def __server_get(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        # make sure there's a field
+        if len(cmd) == 2:
+            return (CommandReturn.MISSING_REQUIRED_VAR, "server: get: No field specified")
+        field = cmd[2].lower()
+        if field == 'port':
+            return (_ok_check_length(3, cmd), str(self.server.port))
+        if field == 'interface':
+            return (_ok_check_length(3, cmd), str(self.server.interface))
+        return (CommandReturn.BAD_VAR_TYPE, f"server: get: Unknown field {field}")
+
+    def __start(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        if cmd[0] == 'client':  self.client.start()
+        else:                   self.server.start()
+        return (_ok_check_length(2, cmd), f"{cmd[0]}: Started")
+
+    def __stop(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        if cmd[0] == 'client':  self.client.stop()
+        else:                   self.server.stop()
+        return (_ok_check_length(2, cmd), f"{cmd[0]}: Stopped")
+
+    def __status(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        if cmd[0] == 'client':  return (_ok_check_length(2, cmd), str(self.client.status))
+        else:                   return (_ok_check_length(2, cmd), str(self.server.status))
+
+    def __client_connect(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        self.client.connect()
+        return (_ok_check_length(2, cmd), "client: Connected")
+
+    def __client_disconnect(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        self.client.disconnect()
+        return (_ok_check_length(2, cmd), "client: Disconnected")
+
+    def __server_send(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        self.server.send(cmd[2])
+        return (_ok_check_length(3, cmd), f"server: Sent message {shlex.quote(cmd[2])}")
+
+    def __client_help(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        return (_ok_check_length(2, cmd), "client: Known verbs: set, get, connect, disconnect, start, stop, status")
+
+    def __server_help(self, cmd: List[str]) -> Tuple[CommandReturn, str]:
+        return (_ok_check_length(2, cmd), "server: Known verbs: set, get, start, stop, status, send")
 
 
     def launch(self) -> None:
@@ -190,7 +231,7 @@ class ControllerCLI:
                 continue
 
             try:
-                retcode, retval = self.__parse(shlex.split(cmd))
+                retcode, retval = self.__parse(_split_command(cmd))
                 print(retval)
             except Exception as e:
                 logging.exception(e)
@@ -2,16 +2,15 @@
 
 import threading
 import socket
-import time
 import logging
-import collections
-import json
-import enum
-import random
+import secrets
+import queue
 
-from typing import List, SupportsInt, Union, Callable, Optional, Dict, Tuple
+from typing import List, Union, Callable, Optional, Dict
 
-from . import networking_utils, connection
+from . import connection
+
+CALLBACK_WORKER_COUNT = 4
 
 class ClientState:
     STATE_UNDEFINED  = 0x0000
@@ -34,19 +33,20 @@ class ClientState:
     @classmethod
     def get_name(cls, state: int) -> Union[str, None]:
         # look for exact matches
-        for key,value in vars(cls).items():
-            if isinstance(value, int) and value == state:
-                return key
+        name = cls._NAME_BY_VALUE.get(state)
+        if name is not None: return name
         # look for partial matches
-        out = ""
-        for key,value in vars(cls).items():
-            if isinstance(value, int) and (value&state):
-                out += ", " + cls.get_name(value)
+        out = ", ".join(name for bit,name in cls._BITS if bit & state)
         # no matches
-        return None if (not out) else out[2:]
+        return out or None
 
+# lookup tables for ClientState.get_name, built once instead of per call
+ClientState._NAME_BY_VALUE = { value:key for key,value in vars(ClientState).items() if isinstance(value, int) }
+ClientState._BITS = tuple((value,key) for value,key in ClientState._NAME_BY_VALUE.items() if value and not (value & (value-1)))
 
 class ClientStateTransition:
+    __slots__ = ('__from', '__to')
+
     def __init__(self, frm: int, to: int):
         self.__from = frm or ClientState.STATE_UNDEFINED
         self.__to   = to  or ClientState.STATE_UNDEFINED
@@ -61,35 +61,49 @@ class ClientStateTransition:
 
 
 class Client:
+    # known callback verbs, and the characters stripped from verbs passed to subscribe
+    __callback_verbs = frozenset({ 'connect', 'disconnect', 'reconnect', 'servershutdown', 'message', 'statechange' })
+    __verb_strip_table = str.maketrans('', '', '-_')
+
+    __slots__ = (
+        'attempt_reconnect', '__client_id', '__address', '__port', '__interface', '__bind_port',
+        '__logger', '__conn', '__state_lock', '__state', '__cancel_reconnect',
+        '__callbacks', '__callback_queue', '__callback_workers', '__callback_lock',
+        '__recv_consumer_thread', '__recv_consumer_should_run',
+    )
+
     def __init__(self, attempt_reconnect: Optional[bool] = True):
         # init vars
         self.attempt_reconnect = attempt_reconnect
-        self.__client_id = None
-        self.__address = None
-        self.__port = None
-        self.__interface = None
-        self.__bind_port = None
+        self.__client_id: Optional[str] = None
+        self.__address: Optional[str] = None
+        self.__port: Optional[int] = None
+        self.__interface: Optional[str] = None
+        self.__bind_port: Optional[int] = None
         # init objects
         self.__logger = logging.getLogger('missioncommander.client')
-        self.__conn: connection.ConnectionHandler = None
+        self.__conn: Optional[connection.ConnectionHandler] = None
         # status information
         self.__state_lock = threading.Lock()
         self.__state: int = ClientState.STATE_NEEDS_INIT | ClientState.STATE_NOT_CONNECTED
+        self.__cancel_reconnect = threading.Event()
         # callback stuff
-        self.__callback_verbs: List[str] = ['connect', 'disconnect', 'reconnect', 'servershutdown', 'message', 'statechange']
         self.__callbacks: Dict[str, List[Callable]] = { verb:[] for verb in self.__callback_verbs }
-        self.__callback_threads: List[threading.Thread] = []
+        self.__callback_queue: queue.Queue = queue.Queue()
+        self.__callback_workers: List[threading.Thread] = []  # empty while the pool is stopped
+        self.__callback_lock = threading.Lock()  # guards starting/stopping the pool against __trigger
+        self.__start_callback_workers()
         # message consumer stuff
-        self.__recv_consumer_thread = None
+        self.__recv_consumer_thread: Optional[threading.Thread] = None
         # announce
         self.__logger.info("Client inited\n")
     
     @staticmethod
     def generate_new_id() -> str:
-        ID_LENGTH = 16
-        return ''.join(random.choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=ID_LENGTH))
+        ID_BYTES = 12  # encodes to 16 url-safe characters
+        return secrets.token_urlsafe(ID_BYTES)
     
-    def __check_inited(self):
+    def __check_inited(self) -> None:
         if (
             self.__address   is not None and
             self.__port      is not None and
@@ -101,50 +115,50 @@ class Client:
             self.__set_state(self.state | ClientState.STATE_NEEDS_INIT)
 
     @property
-    def logger(self):
+    def logger(self) -> logging.Logger:
         return self.__logger
     
     # [no setter for logger]
     
     @property
-    def address(self):
+    def address(self) -> Optional[str]:
         return self.__address
     
     @address.setter
-    def address(self, address):
+    def address(self, address: str):
         if self.state & ClientState.STATE_RUNNING:
             raise Exception("Client must be stopped before setting address")
         self.__address = address
         self.__check_inited()
     
     @property
-    def interface(self):
+    def interface(self) -> Optional[str]:
         return self.__interface
     
     @interface.setter
-    def interface(self, interface):
+    def interface(self, interface: str):
         if self.state & ClientState.STATE_RUNNING:
             raise Exception("Client must be stopped before setting interface")
         self.__interface = interface
         self.__check_inited()
     
     @property
-    def client_id(self):
-        return self.__address
+    def client_id(self) -> Optional[str]:
+        return self.__client_id
     
     @client_id.setter
-    def client_id(self, client_id):
+    def client_id(self, client_id: str):
         if self.state & ClientState.STATE_RUNNING:
             raise Exception("Client must be stopped before setting client_id")
         self.__client_id = client_id
         self.__check_inited()
     
     @property
-    def port(self):
+    def port(self) -> Optional[int]:
         return self.__port
     
     @port.setter
-    def port(self, port):
+    def port(self, port: Union[int, str]):
         if self.state & ClientState.STATE_RUNNING:
             raise Exception("Client must be stopped before setting port")
         try:
@@ -155,11 +169,11 @@ class Client:
             self.__check_inited()
     
     @property
-    def bind_port(self):
+    def bind_port(self) -> Optional[int]:
         return self.__bind_port
     
     @bind_port.setter
-    def bind_port(self, bind_port):
+    def bind_port(self, bind_port: Union[int, str]):
         if self.state & ClientState.STATE_RUNNING:
             raise Exception("Client must be stopped before setting bind port")
         try:
@@ -169,39 +183,82 @@ class Client:
         else:
             self.__check_inited()
     
+    def __run_callback(self, event: str, cb: Callable, args: tuple) -> None:
+        try:
+            cb(*args)
+        except Exception as e:
+            self.__logger.error("Callback for event %s failed with error:", event)
+            self.__logger.exception(e)
+    
+    def __callback_worker_func(self) -> None:
+        while True:
+            item = self.__callback_queue.get()
+            if item is None: return  # sentinel; pool is being stopped
+            self.__run_callback(*item)
+    
+    def __start_callback_workers(self) -> None:
+        # top the pool back up to size; workers from a stopped pool are dropped
+        with self.__callback_lock:
+            self.__callback_workers = [th for th in self.__callback_workers if th.is_alive()]
+            while len(self.__callback_workers) < CALLBACK_WORKER_COUNT:
+                th = threading.Thread(target=self.__callback_worker_func, name="ClientCallbackWorker", daemon=True)
+                self.__callback_workers.append(th)
+                th.start()
+    
+    def __stop_callback_workers(self) -> None:
+        # mark the pool stopped and queue one sentinel per worker, under the lock
+        # so nothing is queued behind them. callbacks queued before still run
+        with self.__callback_lock:
+            workers, self.__callback_workers = self.__callback_workers, []
+            for _ in workers:
+                self.__callback_queue.put(None)
+        # (don't join ourselves if stopped from within a callback)
+        current = threading.current_thread()
+        for th in workers:
+            if th is not current: th.join()
+        # anything still queued has no worker left to run it, so run it here
+        # rather than have it fire on the next connect(). (a worker stopping
+        # the pool still needs its own sentinel, so leave the queue alone then)
+        if current in workers: return
+        while True:
+            try: item = self.__callback_queue.get_nowait()
+            except queue.Empty: break
+            if item is not None: self.__run_callback(*item)
+    
     def __trigger(self, event: str, *args) -> None:
         for cb in self.__callbacks[event]:
-            try:
-                th = threading.Thread(target=cb, args=args)
-                self.__callback_threads.append(th)
-                th.start()
-            except:
-                print(f"Error launching callback for event {event}")
+            with self.__callback_lock:
+                if self.__callback_workers:
+                    self.__callback_queue.put((event, cb, args))
+                    continue
+            # pool is stopped (e.x. after disconnect); run the callback right
+            # away instead of leaving it queued for the next connect()
+            self.__run_callback(event, cb, args)
     
-    def subscribe(self, verb: str, callback: Callable) -> bool:
+    def subscribe(self, verb: str, callback: Callable) -> None:
         if not callable(callback): raise ValueError("Callback not a function")
-        verb = verb.lower().replace('-', '').replace('_', '')  # strip on-xyz --> onxyz
+        verb = verb.lower().translate(self.__verb_strip_table)  # strip on-xyz --> onxyz
         if verb.startswith('on'): verb = verb[2:]              # strip onxyz --> xyz
         if verb not in self.__callback_verbs: raise KeyError(f"Unknown verb {verb}")
         self.__callbacks[verb].append(callback)
     
     @property
     def state(self) -> int:
-        with self.__state_lock: return self.__state
+        # single attribute read; atomic under the GIL, no lock needed
+        return self.__state
     
-    def __set_state(self, state: int):
-        # check noop
-        with self.__state_lock:
-            if self.__state == state: return
-        # do transition
-        transition = ClientStateTransition(self.state, state)
-        self.__logger.debug(str(transition))
+    def __set_state(self, state: int) -> None:
+        # compare-and-set under the lock; log and notify outside of it
         with self.__state_lock:
+            old_state = self.__state
+            if old_state == state: return
             self.__state = state
+        # do transition
+        transition = ClientStateTransition(old_state, state)
+        self.__logger.debug("%s", transition)  # str(transition) only built if DEBUG is enabled
         self.__trigger('statechange', transition)
     
-    def __recv_consumer_thread_func(self):
-        msg = None
+    def __recv_consumer_thread_func(self) -> None:
         while self.__recv_consumer_should_run:
             if not self.__conn.running:
                 if not self.attempt_reconnect:
@@ -210,22 +267,21 @@ class Client:
                 self.logger.warn("Server connection closed, reconnecting...")
                 if not self.__reconnect_wrapper():  return
                 self.logger.info("Reconnected.")
-            msg: connection.Message = self.__conn.recv()
+            # block until the handler queues a message or stops; the timeout
+            # only bounds how long a missed wakeup could go unnoticed
+            msg = self.__conn.wait_for_recv(timeout=1.0)
             if msg is not None:
                 # look for shutdown command
-                if msg.subject == 'shutdown':
+                if msg.subject == connection.SUBJECT_SHUTDOWN:
                     self.logger.info("Server is shutting down. Closing connection")
                     self.__server_shut_down()
                 # message received. callbacks, callbacks, callbacks!
                 else:  self.__trigger('message', msg)
-            # clear out old threads
-            for i,th in enumerate(self.__callback_threads):
-                if not th.is_alive(): self.__callback_threads.pop(i)
     
 
     def connect(self) -> bool:
         # fail condition
-        def __fail_connect(unexpected: bool = False) -> False:
+        def __fail_connect(unexpected: bool = False) -> bool:
             self.__set_state((ClientState.STATE_UNEXP_CLOSED*unexpected) | ClientState.STATE_CONNECT_FAILED | ClientState.STATE_NOT_CONNECTED)
             self.__conn = None
             return False
@@ -241,55 +297,19 @@ class Client:
         if not (self.state & ClientState.STATE_NOT_CONNECTED):
             self.__logger.error("Client is already connected")
             return False
-        # variables all set. try bind
+        # variables all set. make sure callbacks can run (pool is stopped on disconnect)
+        self.__cancel_reconnect.clear()
+        self.__start_callback_workers()
+        # try bind, connect and negotiate
         self.__set_state(ClientState.STATE_OK | ClientState.STATE_CONNECTING)
-        self.__conn = connection.ConnectionHandler()
-        try:
-            if self.__bind_port is not None and self.__interface is not None:
-                self.__logger.debug(f"Binding outbound socket to {self.__interface}:{self.__bind_port}")
-                self.__conn.sock.bind((self.__interface, self.__bind_port))
-            else:
-                self.__logger.debug(f"Using any available interface+port pair")
-        except socket.timeout:
-            self.__logger.error("Socket connection timed out during interface bind")
-            return __fail_connect(True)
-            return False
-        except Exception as e:
-            self.__logger.error("socket.bind failed with error:")
-            self.__logger.exception(e)
-            return __fail_connect(False)
-        # bind good (or skipped). attempt connect
-        try:
-            self.__conn.sock.connect((self.__address, self.__port))
-        except socket.timeout:
-            self.__logger.error("Socket connection timed out during initial connect")
-            return __fail_connect(True)
-            return False
-        except ConnectionRefusedError:
+        err = self.__open_connection()
+        if err == 'refused':
+            # not fatal; the recv consumer sees the dead connection and reconnects
             self.__logger.warn("Connection refused. Reconnecting...")
-        except Exception as e:
-            self.__logger.error("socket.connect failed with error:")
-            self.__logger.exception(e)
-            return __fail_connect(False)
-        # connect successful. start ticking handler
-        try:
-            self.__conn.start()
-        except Exception as e:
-            self.__logger.error("ConnectionHandler.start failed with error:")
-            self.__logger.exception(e)
-            return __fail_connect(False)
-        # start successful. do client_id negotiation
-        try:
-            self.__conn.send(connection.Message('negotiation', { 'id': self.__client_id }))
-        except socket.timeout:
-            self.__logger.error("Socket connection timed out during client ID negotiation")
-            return __fail_connect(True)
-        except Exception as e:
-            self.__logger.error("Client ID negotiation failed with error:")
-            self.__logger.exception(e)
-            return __fail_connect(False)
+        elif err is not None:
+            return __fail_connect(err == 'timeout')
         # handshake successful. connection is ready to use.
-        self.__logger.info(f"Connected successfully. Client ID: {self.__client_id}")
+        self.__logger.info("Connected successfully. Client ID: %s", self.__client_id)
         self.__set_state(ClientState.STATE_OK | ClientState.STATE_CONNECTED)
         # start recv consumer thread
         self.__recv_consumer_should_run = True
@@ -298,21 +318,18 @@ class Client:
         self.__trigger('connect', self.__client_id)
         return True
     
-    def __reconnect_wrapper(self):
+    def __reconnect_wrapper(self) -> bool:
         sleeptime = 0.1
         rec_again = self.attempt_reconnect
         if not rec_again: return False
         self.__set_state(ClientState.STATE_RECONNECTING | ClientState.STATE_CONNECTING | ClientState.STATE_OK)
         while rec_again:
-            self.__logger.info(f"Attempting reconnect after {sleeptime} seconds...")
-            # do wait loop
-            start = time.perf_counter()
-            while (time.perf_counter() - start < sleeptime):
-                if not self.attempt_reconnect:
-                    self.__logger.warn("No longer attempting reconnect.")
-                    self.__set_state(ClientState.STATE_RECONNECT_FAILED | ClientState.STATE_NOT_CONNECTED)
-                    return False
-                time.sleep(0.1)
+            self.__logger.info("Attempting reconnect after %s seconds...", sleeptime)
+            # wait out the backoff, waking early if disconnect() cancels us
+            if self.__cancel_reconnect.wait(sleeptime) or not self.attempt_reconnect:
+                self.__logger.warn("No longer attempting reconnect.")
+                self.__set_state(ClientState.STATE_RECONNECT_FAILED | ClientState.STATE_NOT_CONNECTED)
+                return False
             # timer is expired, do reconnect step
             sleeptime = min(sleeptime*2, 15)
             rec_again = not self.__reconnect()
@@ -321,73 +338,103 @@ class Client:
         self.__logger.info("Successfully reconnected")
         return True
 
-    def __reconnect(self):
+    def __reconnect(self) -> bool:
+        if self.__open_connection() is not None:
+            return False
+        # handshake successful. connection is ready to use.
+        self.__logger.info("Reconnected successfully. Client ID: %s", self.__client_id)
+        # resume recv consumer thread
+        self.__recv_consumer_should_run = True
+        return True
+    
+    def __open_connection(self) -> Optional[str]:
+        """
+        Makes a new connection handler, binds and connects its socket, starts it
+        and queues the client ID negotiation. Shared by :meth:`connect` and
+        reconnects.
+
+        Returns :const:`None` on success, otherwise one of ``'timeout'``,
+        ``'refused'`` or ``'error'``. Failures are logged here, except for a
+        refused connection, which is left to the caller.
+        """
         self.__conn = connection.ConnectionHandler()
-        # try re-bind
+        # try bind
         try:
             if self.__bind_port is not None and self.__interface is not None:
-                self.__logger.debug(f"Binding outbound socket to {self.__interface}:{self.__bind_port}")
+                self.__logger.debug("Binding outbound socket to %s:%s", self.__interface, self.__bind_port)
                 self.__conn.sock.bind((self.__interface, self.__bind_port))
             else:
-                self.__logger.debug(f"Using any available interface+port pair")
+                self.__logger.debug("Using any available interface+port pair")
         except socket.timeout:
             self.__logger.error("Socket connection timed out during interface bind")
-            return False
-        except ConnectionRefusedError: return False
+            self.__conn.sock.close()
+            return 'timeout'
         except Exception as e:
             self.__logger.error("socket.bind failed with error:")
             self.__logger.exception(e)
-            return False
-        # bind good (or not asked for). attempt connect
+            self.__conn.sock.close()
+            return 'error'
+        # bind good (or skipped). attempt connect
         try:
             self.__conn.sock.connect((self.__address, self.__port))
         except socket.timeout:
             self.__logger.error("Socket connection timed out during initial connect")
-            return False
-        except ConnectionRefusedError: return False
+            self.__conn.sock.close()
+            return 'timeout'
+        except ConnectionRefusedError:
+            self.__conn.sock.close()
+            return 'refused'
         except Exception as e:
             self.__logger.error("socket.connect failed with error:")
             self.__logger.exception(e)
-            return False
+            self.__conn.sock.close()
+            return 'error'
         # connect successful. start ticking handler
         try:
             self.__conn.start()
         except Exception as e:
             self.__logger.error("ConnectionHandler.start failed with error:")
             self.__logger.exception(e)
-            return False
+            return 'error'
         # start successful. do client_id negotiation
         try:
-            self.__conn.send(connection.Message('negotiation', { 'id': self.__client_id }))
+            self.__conn.send(connection.Message(connection.SUBJECT_NEGOTIATION, { 'id': self.__client_id }))
         except socket.timeout:
             self.__logger.error("Socket connection timed out during client ID negotiation")
-            return False
+            return 'timeout'
         except Exception as e:
             self.__logger.error("Client ID negotiation failed with error:")
             self.__logger.exception(e)
-            return False
-        # handshake successful. connection is ready to use.
-        self.__logger.info(f"Reconnected successfully. Client ID: {self.__client_id}")
-        # resume recv consumer thread
-        self.__recv_consumer_should_run = True
-        return True
+            return 'error'
+        return None
     
     def disconnect(self) -> bool:
         self.__trigger('disconnect')
         # pre-exec variable checks
-        # is already disconnected?
-        if not (self.state & ClientState.STATE_CONNECTED):
+        # is already disconnected? (a client waiting out a reconnect backoff
+        # isn't connected, but its recv consumer is still alive and retrying)
+        if not (self.state & (ClientState.STATE_CONNECTED | ClientState.STATE_RECONNECTING)):
             self.__logger.error("Client is not connected")
             return False
-        # variables all set. stop recv consumer
+        # variables all set. stop recv consumer, cancelling any pending reconnect
         self.attempt_reconnect = False
+        self.__cancel_reconnect.set()
         if self.__recv_consumer_thread is not None:
             self.__recv_consumer_should_run = False
+        if self.state & ClientState.STATE_RECONNECTING:
+            # wait for the consumer to give up. unless a reconnect won the race,
+            # there's no live connection to shut down
+            self.__join_recv_consumer()
+            if self.__conn is None or not self.__conn.running:
+                self.__conn = None
+                self.__set_state(ClientState.STATE_NOT_CONNECTED | ClientState.STATE_OK)
+                self.__stop_callback_workers()
+                return True
         # send shutdown message to server
         did_err = False
         did_time_out = False
         try:
-            self.__conn.send(connection.Message('shutdown', {}))
+            self.__conn.send(connection.Message(connection.SUBJECT_SHUTDOWN, {}))
         except socket.timeout:
             self.__logger.error("Socket connection timed out during sending of shutdown message")
             did_err = True
@@ -413,11 +460,18 @@ class Client:
         else:
             self.__set_state(ClientState.STATE_NOT_CONNECTED | ClientState.STATE_OK)
         # (make sure recv consumer stopped)
-        if self.__recv_consumer_thread is not None and self.__recv_consumer_thread.is_alive():
-            self.__recv_consumer_thread.join()
+        self.__join_recv_consumer()
+        # let pending callbacks finish, then stop the callback workers
+        self.__stop_callback_workers()
         return not did_err
     
-    def __server_shut_down(self):
+    def __join_recv_consumer(self) -> None:
+        # (don't join ourselves if disconnected from within the consumer)
+        th = self.__recv_consumer_thread
+        if th is not None and th.is_alive() and th is not threading.current_thread():
+            th.join()
+    
+    def __server_shut_down(self) -> None:
         self.__trigger('servershutdown')
         # stop recv consumer
         if self.__recv_consumer_thread is not None:
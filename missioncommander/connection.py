@@ -1,45 +1,137 @@
 import enum
+import sys
+import functools
+import struct
 import socket
+import selectors
 import threading
 import collections
 import time
 import json
 
-from typing import Union, Dict, Optional, Callable, List
+from typing import Union, Dict, Optional, Callable, List, Tuple, Any
 
-HEADER_LEN_BYTES = 64
-CHUNK_SIZE_BYTES = 2048
+# make logger for this module
+import logging
+_logger = logging.getLogger('missioncommander.connection')
+
+# frame header: payload length (u32) and subject length (u16), big-endian. the
+# utf-8 subject follows the header, then the payload
+HEADER_STRUCT = struct.Struct('>IH')
+HEADER_LEN_BYTES = HEADER_STRUCT.size
+MAX_SUBJECT_LEN_BYTES = 0xFFFF
+# biggest subject+payload accepted from a peer. the length comes off the wire,
+# so anything larger is treated as garbage and the connection is dropped
+# instead of allocating a buffer for it
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+CHUNK_SIZE_BYTES = 65536
+SOCKET_BUFFER_BYTES = 1 << 20  # requested SO_SNDBUF / SO_RCVBUF size
+SEND_BATCH_SIZE = 16  # max queued messages written per sendmsg() call
+MAX_LOGGED_BODY_BYTES = 64 * 1024  # bigger unparseable bodies aren't dumped to the log
+
+# not available on every platform (e.x. Windows); fall back to one send per message
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
+# subjects with a protocol meaning. Message interns every subject, so comparing
+# against these is an identity check in the common case
+SUBJECT_NEGOTIATION = sys.intern('negotiation')
+SUBJECT_SHUTDOWN    = sys.intern('shutdown')
+
+# payload (de)serializers. orjson is optional; it is much faster than the
+# stdlib json module and works on bytes directly
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # one compact encoder for every message, like orjson's output; reusing it
+    # skips json.dumps' per-call argument handling
+    _encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+    def _dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode('utf-8')
+    _loads = json.loads  # (accepts utf-8 bytes as-is)
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_subject(subject: str) -> bytes:
+    # the same few subjects are sent over and over, so only encode and check
+    # each one once
+    encoded = subject.encode('utf-8')
+    if len(encoded) > MAX_SUBJECT_LEN_BYTES:
+        raise OverflowError(f"Subject too long! (max {MAX_SUBJECT_LEN_BYTES} bytes, got {len(encoded)})")
+    return encoded
 
 
 class Message:
+    __slots__ = ('__subject', '__payload', '__wire')
+
     def __init__(self, subject: str, payload: Dict[str, Union[str,int,float,bool]]):
-        self.__subject = subject
+        self.__subject = sys.intern(subject)
         self.__payload = payload
+        self.__wire: Optional[bytes] = None
 
     @property
     def subject(self) -> str:
         return self.__subject
     
     @property
-    def payload(self) -> str:
+    def payload(self) -> Dict[str, Union[str,int,float,bool]]:
         return self.__payload
     
     def serialize(self) -> bytes:
-        return json.dumps(self.payload, indent=None).encode('utf-8')
+        return _dumps(self.payload)
     
     @classmethod
-    def deserialize(cls, subject: str, bytes_in: bytes):
-        data = json.loads(bytes_in.decode('utf-8'))
+    def deserialize(cls, subject: str, bytes_in: Union[bytes, bytearray]) -> 'Message':
+        data = _loads(bytes_in)
         return cls(subject, data)
+    
+    def to_wire(self) -> bytes:
+        """
+        Returns the framed message as sent on the wire: the fixed-size binary
+        header (see :const:`HEADER_STRUCT`), the utf-8 subject, then the
+        serialized payload.
+
+        The result is cached, so a message sent to several connections (e.x.
+        a server broadcast) is only serialized once.
+        """
+        if self.__wire is None:
+            bytes_out = self.serialize()
+            subject = _encode_subject(self.subject)
+            header = HEADER_STRUCT.pack(len(bytes_out), len(subject))
+            self.__wire = b''.join((header, subject, bytes_out))  # one copy of the body
+        return self.__wire
 
 
 class ConnectionHandler:
-    def __init__(self, use_socket=None):
+    __slots__ = (
+        '__thread', '__should_run',
+        '__outbound_message_queue', '__inbound_message_queue', '__send_backlog', '__inbound_event',
+        '__header_buf', '__header_view',
+        '__selector', '__wakeup_recv', '__wakeup_send',
+        '__sock',
+    )
+
+    def __init__(self, use_socket: Optional[socket.socket] = None):
         # thread stuff
-        self.__thread = None
+        self.__thread: Optional[threading.Thread] = None
         self.__should_run = False
         self.__outbound_message_queue = collections.deque()
         self.__inbound_message_queue  = collections.deque()
+        # a batch the socket timed out on part way through, and what's left of
+        # it. resumed from the same offset next tick instead of starting over
+        self.__send_backlog: Optional[Tuple[List[Message], List[memoryview]]] = None
+        # set whenever a message is queued inbound or the handler stops, so
+        # consumers can block instead of polling recv()
+        self.__inbound_event = threading.Event()
+        # reused for every header read, so receiving doesn't allocate per chunk
+        self.__header_buf = bytearray(HEADER_LEN_BYTES)
+        self.__header_view = memoryview(self.__header_buf)
+        # readiness polling; the wakeup pair lets send() and stop() interrupt
+        # a select() that would otherwise wait for the socket
+        self.__selector: Optional[selectors.BaseSelector] = None
+        self.__wakeup_recv: Optional[socket.socket] = None
+        self.__wakeup_send: Optional[socket.socket] = None
         # socket stuff
         if use_socket is not None:
             self.sock = use_socket
@@ -47,6 +139,18 @@ class ConnectionHandler:
             self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.__sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.__sock.settimeout(1.0)
+            self.__tune_socket(self.__sock)
+    
+    @staticmethod
+    def __tune_socket(sock: socket.socket) -> None:
+        # messages are small and latency-sensitive, so don't let Nagle hold them
+        # back; bigger kernel buffers let large payloads stream without stalls.
+        # the kernel may clamp or ignore these, which is fine
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+        except OSError: pass
     
     @property
     def sock(self) -> socket.socket:
@@ -58,121 +162,201 @@ class ConnectionHandler:
             raise AttributeError("Cannot be running")
         if not isinstance(sock, socket.socket):
             raise ValueError("Not a socket")
+        self.__tune_socket(sock)
         self.__sock = sock
     
     @property
-    def running(self):
+    def running(self) -> bool:
         return self.__thread is not None and self.__thread.is_alive()
     
     def __recv_queue_tick(self) -> bool:
         # receive header
         bytes_recvd = 0
-        chunks: List[bytes] = []
         while bytes_recvd < HEADER_LEN_BYTES:
             try:
-                chunk = self.__sock.recv(HEADER_LEN_BYTES - bytes_recvd)
-            except socket.timeout:  return True  # return True because False or None will stop connection
-            if chunk == b'':  return False
-            chunks.append(chunk)
-            bytes_recvd += len(chunk)
-        # assemble and parse header
-        try:
-            header = b''.join(chunks).decode('utf-8')
-            header = header.replace(b'\x00'.decode(), '')  # remove null bytes
-            header = json.loads(header)
-            msglen, subj = header['length'], header['subject']
-        except Exception as e:
-            print("Failed to parse message header, with exception: ", e)
-            print("Header:", header)
-            return True  # return True because False or None will stop connection
-        # receive message
+                n = self.__sock.recv_into(self.__header_view[bytes_recvd:])
+            except socket.timeout:
+                # nothing read yet: return True because False or None will stop connection
+                if bytes_recvd == 0:  return True
+                # part of a header; keep waiting for the rest, or the stream loses sync
+                if not self.__should_run:  return False
+                continue
+            except OSError:
+                _logger.info("Connection closed unexpectedly during recv", exc_info=True)
+                return False
+            if n == 0:
+                # between messages this is the peer closing normally
+                if bytes_recvd == 0:  _logger.debug("Connection closed by peer")
+                else:                 _logger.info("Connection closed unexpectedly mid-message")
+                return False
+            bytes_recvd += n
+        # parse header. subject and payload are read together below
+        bodylen, subjlen = HEADER_STRUCT.unpack_from(self.__header_buf)
+        msglen = subjlen + bodylen
+        if msglen > MAX_FRAME_BYTES:
+            _logger.warning("Frame too large (%d bytes, max %d); dropping connection", msglen, MAX_FRAME_BYTES)
+            return False
+        # receive message straight into one buffer, no per-chunk bytes objects
+        body = bytearray(msglen)
+        view = memoryview(body)
         bytes_recvd = 0
-        chunks: List[bytes] = []
         while bytes_recvd < msglen:
-            chunk = self.__sock.recv(min(msglen - bytes_recvd, CHUNK_SIZE_BYTES))
-            if chunk == b'':  return False
-            chunks.append(chunk)
-            bytes_recvd += len(chunk)
-        # assemble and parse message
+            try:
+                n = self.__sock.recv_into(view[bytes_recvd:], min(msglen - bytes_recvd, CHUNK_SIZE_BYTES))
+            except socket.timeout:
+                # mid-message, so keep waiting for the rest unless we're stopping
+                if not self.__should_run:  return False
+                continue
+            except OSError:
+                _logger.info("Connection closed unexpectedly during recv", exc_info=True)
+                return False
+            if n == 0:
+                _logger.info("Connection closed unexpectedly mid-message")
+                return False
+            bytes_recvd += n
+        view.release()
+        # split off the subject and parse message
         try:
-            body = b''.join(chunks)
+            subj = body[:subjlen].decode('utf-8')
+            del body[:subjlen]  # cheap for bytearray, leaves just the payload
             msg = Message.deserialize(subj, body)
         except Exception as e:
-            print("Failed to parse message body, with exception: ", e)
-            print("Body:", body)
+            _logger.warning("Failed to parse message body: %s", e)
+            if _logger.isEnabledFor(logging.DEBUG) and len(body) <= MAX_LOGGED_BODY_BYTES:
+                _logger.debug("Body: %r", bytes(body))
             return True  # return True because False or None will stop connection
         self.__inbound_message_queue.append(msg)
+        self.__inbound_event.set()
         return True
     
     def __send_queue_tick(self) -> bool:
-        # check for message
-        try: _msg: Message = self.__outbound_message_queue.popleft()
-        except IndexError: return True  # return True because False or None will stop connection
-        bytes_out = _msg.serialize()
-        # define header
+        queue = self.__outbound_message_queue
+        while queue or self.__send_backlog:
+            if self.__send_backlog is not None:
+                batch, views = self.__send_backlog
+                self.__send_backlog = None
+            else:
+                batch, views = self.__frame_batch()
+            # send the batch, one gathered write per call where supported.
+            # slicing the memoryviews doesn't copy
+            while views:
+                try:
+                    if _HAS_SENDMSG:  sent = self.__sock.sendmsg(views)
+                    else:             sent = self.__sock.send(views[0])
+                except socket.timeout:
+                    # peer isn't keeping up; hold our place and retry next tick
+                    self.__send_backlog = (batch, views)
+                    return True
+                except OSError:
+                    _logger.info("Connection closed unexpectedly during send", exc_info=True)
+                    sent = 0
+                if sent == 0:  # either an error occurred, or nothing was sent
+                    queue.extendleft(reversed(batch[-len(views):]))  # put unsent messages back in queue
+                    return False
+                while views and sent >= len(views[0]):
+                    sent -= len(views.pop(0))
+                if sent:  views[0] = views[0][sent:]
+        return True
+    
+    def __frame_batch(self) -> Tuple[List[Message], List[memoryview]]:
+        # frame a batch of messages (cached on the message, so broadcasts and
+        # requeued messages only serialize once)
+        queue = self.__outbound_message_queue
+        batch: List[Message] = []
+        views: List[memoryview] = []
+        while queue and len(batch) < SEND_BATCH_SIZE:
+            _msg = queue.popleft()
+            try:
+                views.append(memoryview(_msg.to_wire()))
+            except Exception as e:
+                _logger.warning("Could not pack message: %s", e)
+                continue
+            batch.append(_msg)
+        return batch, views
+    
+    def __main_loop(self) -> None:
         try:
-            header = json.dumps({ 'length': len(bytes_out), 'subject': _msg.subject }, indent=None)
-            header = header.encode('utf-8')
-            if len(header) > HEADER_LEN_BYTES:
-                raise OverflowError(f"Header length too big! Make HEADER_LEN_BYTES larger! (current: {HEADER_LEN_BYTES})")
-            header = header.ljust(HEADER_LEN_BYTES, b'\x00')
+            self.__run_ticks()
         except Exception as e:
-            print("Could not pack header, with exception: ", e)
-            print("Header:", header)
-            return True  # return True because False or None will stop connection
-        # send header
-        total = 0
-        while total < len(header):
-            sent = self.__sock.send(header[total:])
-            if sent == 0:
-                self.__outbound_message_queue.appendleft(_msg)  # put message back in queue
-                return False
-            total += sent
-        # send message
-        total = 0
-        while total < len(bytes_out):
-            try:
-                sent = self.__sock.send(bytes_out[total:])
-            except: sent = 0
-            if sent == 0:  # either an error occurred, or nothing was sent
-                self.__outbound_message_queue.appendleft(_msg)  # put message back in queue
-                return False
-            total += sent
-        return True
+            _logger.error("Connection handler failed with error:")
+            _logger.exception(e)
+        finally:
+            # whatever ended the loop, consumers must not keep waiting on it
+            self.__should_run = False
+            self.__inbound_event.set()
+            # a half-sent batch is meaningless without the socket it was going to
+            self.__send_backlog = None
+            # socket might have been unexpectedly closed, so try/except/pass these
+            try: self.__selector.close()
+            except: pass
+            self.__wakeup_recv.close()
+            self.__wakeup_send.close()
+            try: self.__sock.shutdown(socket.SHUT_RDWR)
+            except: pass
+            try: self.__sock.close()
+            except: pass
     
-    def __main_loop(self):
+    def __run_ticks(self) -> None:
         while self.__should_run:
-            # read any incoming
-            if not self.__recv_queue_tick():
-                print("Connection closed unexpectedly during recv queue tick")
+            # wait until the socket is readable, or send()/stop() wakes us up.
+            # nothing else needs a periodic tick, except retrying a send that
+            # timed out, so an idle connection sleeps until there's work
+            timeout = None if self.__send_backlog is None else 1.0
+            try:
+                events = self.__selector.select(timeout=timeout)
+            except (OSError, ValueError):
+                _logger.info("Connection closed unexpectedly while waiting for events", exc_info=True)
+                self.stop(blocking=False); continue
+            readable = False
+            for key, _ in events:
+                if key.fileobj is self.__wakeup_recv:
+                    try: self.__wakeup_recv.recv(4096)
+                    except OSError: pass
+                else:  readable = True
+            # read any incoming. (the ticks log why a connection closed)
+            if readable and not self.__recv_queue_tick():
                 self.stop(blocking=False); continue
             # send any outgoing
             if not self.__send_queue_tick():
-                print("Connection closed unexpectedly during send queue tick")
                 self.stop(blocking=False); continue
-        # socket might have been unexpectedly closed, so try/except/pass these
-        try: self.__sock.shutdown(socket.SHUT_RDWR)
-        except: pass
-        try: self.__sock.close()
+        # flush anything queued just before stop() (e.x. a shutdown message)
+        try: self.__send_queue_tick()
         except: pass
     
-    def start(self):
+    def __wake(self) -> None:
+        # the pair is closed once the loop exits, and a full buffer already
+        # means a wakeup is pending, so errors here are harmless
+        try: self.__wakeup_send.send(b'\x00')
+        except (OSError, AttributeError): pass
+    
+    def start(self) -> None:
         self.__should_run = True
+        self.__wakeup_recv, self.__wakeup_send = socket.socketpair()
+        self.__wakeup_recv.setblocking(False)
+        self.__wakeup_send.setblocking(False)
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.__sock, selectors.EVENT_READ)
+        self.__selector.register(self.__wakeup_recv, selectors.EVENT_READ)
+        # messages queued before start() had nothing to wake; flush them now
+        if self.__outbound_message_queue:  self.__wake()
         self.__thread = threading.Thread(target=self.__main_loop, name='ReconnectingStreamingSocket')
         self.__thread.start()
     
-    def stop(self, blocking:bool=True):
+    def stop(self, blocking: bool = True) -> None:
         self.__should_run = False
+        self.__inbound_event.set()  # wake anyone blocked in wait_for_recv
+        self.__wake()
         if blocking and self.__thread is not None: self.__thread.join()
     
-    def send(self, message: Message):
+    def send(self, message: Message) -> None:
         if not isinstance(message, Message):
             raise ValueError("Not of class Message")
         self.__outbound_message_queue.append(message)
+        self.__wake()
     
     def recv(self) -> Union[Message, None]:
-        try: return self.__inbound_message_queue.popleft()
-        except IndexError: return None
+        queue = self.__inbound_message_queue
+        return queue.popleft() if queue else None
 
     def wait_for_recv(self, timeout: float = 5.0) -> Union[Message, None]:
         """
@@ -181,11 +365,20 @@ class ConnectionHandler:
 
         If :attr:`timeout` is a positive float greater than 0.0, it will
         determine if there is a time limit to this function. If that time
-        limit is met, this function returns :const:`None`.
+        limit is met, this function returns :const:`None`. :const:`None` is
+        also returned once the handler has been stopped.
         """
-        msg = None
-        start_time = time.perf_counter()
+        deadline = time.monotonic() + timeout if timeout > 0 else None
         while True:
+            # clear before checking the queue so a message appended in between
+            # still leaves the event set
+            self.__inbound_event.clear()
             msg = self.recv()
             if msg is not None: return msg
-            if (timeout>0) and (time.perf_counter() - start_time >= timeout): return None
+            if not self.__should_run: return None
+            if deadline is None:
+                self.__inbound_event.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: return None
+            self.__inbound_event.wait(remaining)
@@ -13,6 +13,17 @@ widget_spacing: Dict[str, Union[int, str]] = {
     'pady': 4,
 }
 
+# pack options for spaced widgets, built once rather than merged on every call
+pack_spaced_left:         Dict[str, Union[int, str]] = { **widget_spacing, 'fill': 'both', 'side': 'left' }
+pack_spaced_right:        Dict[str, Union[int, str]] = { **widget_spacing, 'fill': 'both', 'side': 'right' }
+pack_spaced_left_expand:  Dict[str, Union[int, str]] = { **pack_spaced_left,  'expand': 1 }
+pack_spaced_right_expand: Dict[str, Union[int, str]] = { **pack_spaced_right, 'expand': 1 }
+
+flat_frame_style: Dict[str, Union[int, str]] = {
+    'relief': 'flat',
+    'border': 0,
+}
+
 class SettingsEntry:
     def __init__(self, root_frame: ttk.Frame, label: str, callback: Callable):
         # internal vars
@@ -20,17 +31,17 @@ class SettingsEntry:
         self.__text = tk.StringVar()
         self.__callback = callback
         # containers for dynamic spacing
-        self.__container_frame_1 = ttk.Frame(self.__root,              relief='flat', border=0)
-        self.__container_frame_2 = ttk.Frame(self.__container_frame_1, relief='flat', border=0)
+        self.__container_frame_1 = ttk.Frame(self.__root,              **flat_frame_style)
+        self.__container_frame_2 = ttk.Frame(self.__container_frame_1, **flat_frame_style)
         # inner widgets
         self.__label =  ttk.Label( self.__container_frame_1, text=label, width=14)
         self.__entry =  ttk.Entry( self.__container_frame_2, textvariable=self.__text)
         self.__button = ttk.Button(self.__container_frame_2, text="Set", command=self._set, width=6)
     
     def pack_inner(self):
-        self.__label.pack( **widget_spacing, side='left',            fill='both')
-        self.__button.pack(**widget_spacing, side='right',           fill='both')
-        self.__entry.pack( **widget_spacing, side='left',  expand=1, fill='both')
+        self.__label.pack( **pack_spaced_left)
+        self.__button.pack(**pack_spaced_right)
+        self.__entry.pack( **pack_spaced_left_expand)
         self.__container_frame_2.pack(       side='right', expand=1, fill='both')
         self.__container_frame_1.pack(                     expand=1, fill='both')
     
@@ -91,8 +102,8 @@ class InputFrame:
 def make_message_input_frame(master: tk.Frame, callback: Callable) -> ttk.Labelframe:
     msg_frame = ttk.Labelframe(master, labelwidget=ttk.Label(text="Message"))
     msger = InputFrame(msg_frame, callback)
-    msger.button.pack(**widget_spacing, side='right',           fill='both')
-    msger.entry.pack( **widget_spacing, side='left',  expand=1, fill='both')
+    msger.button.pack(**pack_spaced_right)
+    msger.entry.pack( **pack_spaced_left_expand)
     return msg_frame
 
 
@@ -120,9 +131,9 @@ def make_connection_frame(
     
     # frames
     connection_frame = ttk.Labelframe(master, labelwidget=ttk.Label(text="Connection"))
-    btn_frame =     ttk.Frame(connection_frame, relief='flat', border=0)
-    right_frame =   ttk.Frame(btn_frame,        relief='flat', border=0)
-    left_frame =    ttk.Frame(btn_frame,        relief='flat', border=0)
+    btn_frame =     ttk.Frame(connection_frame, **flat_frame_style)
+    right_frame =   ttk.Frame(btn_frame,        **flat_frame_style)
+    left_frame =    ttk.Frame(btn_frame,        **flat_frame_style)
     # connection status label
     status_label = ttk.Label(connection_frame, textvariable=status_var)
     # buttons
@@ -131,16 +142,16 @@ def make_connection_frame(
     connect_button =    ttk.Button(right_frame, text='Connect',    command=connect_callback,    width=8)  if add_connect_disconnect else None
     disconnect_button = ttk.Button(right_frame, text='Disconnect', command=disconnect_callback, width=10) if add_connect_disconnect else None
     # button packs
-    start_button.pack(     **widget_spacing, fill='both', side='left')
-    stop_button.pack(      **widget_spacing, fill='both', side='right')
-    connect_button.pack(   **widget_spacing, fill='both', side='left')  if add_connect_disconnect else "no-op"
-    disconnect_button.pack(**widget_spacing, fill='both', side='right') if add_connect_disconnect else "no-op"
+    start_button.pack(     **pack_spaced_left)
+    stop_button.pack(      **pack_spaced_right)
+    connect_button.pack(   **pack_spaced_left)  if add_connect_disconnect else "no-op"
+    disconnect_button.pack(**pack_spaced_right) if add_connect_disconnect else "no-op"
     # frame packs
     left_frame.pack(                         fill='both', side='left')
     right_frame.pack(                        fill='both', side='right')
     # top level packs and return
     btn_frame.pack(                          fill='both', side='right')
-    status_label.pack(     **widget_spacing, fill='both', side='left', expand=1)
+    status_label.pack(**pack_spaced_left_expand)
     return (connection_frame, status_label)
 
 
@@ -175,17 +186,17 @@ def make_client_connection_frame(
     
     # frames
     connection_frame = ttk.Labelframe(master, labelwidget=ttk.Label(text="Connection"))
-    settings_frame =   ttk.Frame(connection_frame, relief='flat', border=0)
-    conn_frame =       ttk.Frame(connection_frame, relief='flat', border=0)
-    btn_frame =        ttk.Frame(conn_frame,       relief='flat', border=0)
-    status_frame =     ttk.Frame(conn_frame,       relief='flat', border=0)
+    settings_frame =   ttk.Frame(connection_frame, **flat_frame_style)
+    conn_frame =       ttk.Frame(connection_frame, **flat_frame_style)
+    btn_frame =        ttk.Frame(conn_frame,       **flat_frame_style)
+    status_frame =     ttk.Frame(conn_frame,       **flat_frame_style)
     # settings frames
-    settings_top_frame =     ttk.Frame(settings_frame, relief='flat', border=0)
-    settings_btm_frame =     ttk.Frame(settings_frame, relief='flat', border=0)
-    server_address_frame =   ttk.Frame(settings_top_frame, relief='flat', border=0)
-    server_port_frame =      ttk.Frame(settings_top_frame, relief='flat', border=0)
-    client_interface_frame = ttk.Frame(settings_btm_frame, relief='flat', border=0)
-    client_port_frame =      ttk.Frame(settings_btm_frame, relief='flat', border=0)
+    settings_top_frame =     ttk.Frame(settings_frame, **flat_frame_style)
+    settings_btm_frame =     ttk.Frame(settings_frame, **flat_frame_style)
+    server_address_frame =   ttk.Frame(settings_top_frame, **flat_frame_style)
+    server_port_frame =      ttk.Frame(settings_top_frame, **flat_frame_style)
+    client_interface_frame = ttk.Frame(settings_btm_frame, **flat_frame_style)
+    client_port_frame =      ttk.Frame(settings_btm_frame, **flat_frame_style)
     # settings frame items
     server_address_label =   ttk.Label(     server_address_frame,   width=13, text='Server address: ')
     server_port_label =      ttk.Label(     server_port_frame,      width=5,  text='Port: ')
@@ -196,14 +207,14 @@ def make_client_connection_frame(
     client_interface_input = ttk.OptionMenu(client_interface_frame,           client_interface_var, available_devices[0], *available_devices)
     client_port_input =      ttk.Entry(     client_port_frame,      width=8,  textvariable=client_port_var)
     # settings frame items packs
-    server_address_label.pack(  **widget_spacing, fill='both', side='left')
-    server_address_input.pack(  **widget_spacing, fill='both', side='right', expand=1)
-    server_port_label.pack(     **widget_spacing, fill='both', side='left')
-    server_port_input.pack(     **widget_spacing, fill='both', side='right')
-    client_interface_label.pack(**widget_spacing, fill='both', side='left')
-    client_interface_input.pack(**widget_spacing, fill='both', side='right', expand=1)
-    client_port_label.pack(     **widget_spacing, fill='both', side='left')
-    client_port_input.pack(     **widget_spacing, fill='both', side='right')
+    server_address_label.pack(  **pack_spaced_left)
+    server_address_input.pack(  **pack_spaced_right_expand)
+    server_port_label.pack(     **pack_spaced_left)
+    server_port_input.pack(     **pack_spaced_right)
+    client_interface_label.pack(**pack_spaced_left)
+    client_interface_input.pack(**pack_spaced_right_expand)
+    client_port_label.pack(     **pack_spaced_left)
+    client_port_input.pack(     **pack_spaced_right)
     # settings frames packs
     server_address_frame.pack(  fill='both', side='left', expand=1)
     server_port_frame.pack(     fill='both', side='right')
@@ -217,10 +228,10 @@ def make_client_connection_frame(
     connect_button =    ttk.Button(btn_frame,    text='Connect',    command=connect_callback,    width=8)
     disconnect_button = ttk.Button(btn_frame,    text='Disconnect', command=disconnect_callback, width=10)
     # lower widget packs
-    status_label_label.pack(**widget_spacing, fill='both', side='left')
-    status_label.pack(      **widget_spacing, fill='both', side='right', expand=1)
-    connect_button.pack(    **widget_spacing, fill='both', side='left')
-    disconnect_button.pack( **widget_spacing, fill='both', side='right')
+    status_label_label.pack(**pack_spaced_left)
+    status_label.pack(      **pack_spaced_right_expand)
+    connect_button.pack(    **pack_spaced_left)
+    disconnect_button.pack( **pack_spaced_right)
     # frame packs
     status_frame.pack(                        fill='both', side='left', expand=1)
     btn_frame.pack(                           fill='both', side='right')
@@ -258,23 +269,23 @@ def make_server_connection_frame(
     
     # frames
     connection_frame = ttk.Labelframe(master, labelwidget=ttk.Label(text="Connection"))
-    settings_frame =   ttk.Frame(connection_frame, relief='flat', border=0)
-    conn_frame =       ttk.Frame(connection_frame, relief='flat', border=0)
-    btn_frame =        ttk.Frame(conn_frame,       relief='flat', border=0)
-    status_frame =     ttk.Frame(conn_frame,       relief='flat', border=0)
+    settings_frame =   ttk.Frame(connection_frame, **flat_frame_style)
+    conn_frame =       ttk.Frame(connection_frame, **flat_frame_style)
+    btn_frame =        ttk.Frame(conn_frame,       **flat_frame_style)
+    status_frame =     ttk.Frame(conn_frame,       **flat_frame_style)
     # settings frames
-    interface_frame = ttk.Frame(settings_frame, relief='flat', border=0)
-    port_frame =      ttk.Frame(settings_frame, relief='flat', border=0)
+    interface_frame = ttk.Frame(settings_frame, **flat_frame_style)
+    port_frame =      ttk.Frame(settings_frame, **flat_frame_style)
     # settings frame items
     interface_label = ttk.Label(     interface_frame, width=13, text='Use Interface: ')
     port_label =      ttk.Label(     port_frame,      width=5,  text='Port: ')
     interface_input = ttk.OptionMenu(interface_frame,           interface_var, available_devices[0], *available_devices)
     port_input =      ttk.Entry(     port_frame,      width=8,  textvariable=port_var)
     # settings frame items packs
-    interface_label.pack(**widget_spacing, fill='both', side='left')
-    interface_input.pack(**widget_spacing, fill='both', side='right', expand=1)
-    port_label.pack(     **widget_spacing, fill='both', side='left')
-    port_input.pack(     **widget_spacing, fill='both', side='right')
+    interface_label.pack(**pack_spaced_left)
+    interface_input.pack(**pack_spaced_right_expand)
+    port_label.pack(     **pack_spaced_left)
+    port_input.pack(     **pack_spaced_right)
     # settings frames packs
     interface_frame.pack(fill='both', side='left', expand=1)
     port_frame.pack(     fill='both', side='right')
@@ -284,10 +295,10 @@ def make_server_connection_frame(
     connect_button =    ttk.Button(btn_frame,    text='Start', command=start_callback, width=6)
     disconnect_button = ttk.Button(btn_frame,    text='Stop',  command=stop_callback,  width=6)
     # lower widget packs
-    status_label_label.pack(**widget_spacing, fill='both', side='left')
-    status_label.pack(      **widget_spacing, fill='both', side='right', expand=1)
-    connect_button.pack(    **widget_spacing, fill='both', side='left')
-    disconnect_button.pack( **widget_spacing, fill='both', side='right')
+    status_label_label.pack(**pack_spaced_left)
+    status_label.pack(      **pack_spaced_right_expand)
+    connect_button.pack(    **pack_spaced_left)
+    disconnect_button.pack( **pack_spaced_right)
     # frame packs
     status_frame.pack(                        fill='both', side='left', expand=1)
     btn_frame.pack(                           fill='both', side='right')
@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
 import socket
+import functools
+import threading
 
-from typing import Dict, Any, Callable, Union
+from typing import Dict, Any, Callable, Union, Tuple, Optional
 
 from .frames import make_settings_frame, SettingsEntry
 from .frames import make_log_frame
@@ -19,12 +21,28 @@ frame_spacing: Dict[str, Union[int, str]] = {
     'ipadx': 6,
     'ipady': 2
 }
+frame_spacing_expand: Dict[str, Union[int, str]] = { **frame_spacing, 'expand': 1 }
+
+# how often the Tk main loop picks up client/server state changes, in milliseconds
+STATE_POLL_INTERVAL_MS = 50
 
 # make logger for this module
 import logging
 logging.getLogger('missioncommander.gui')
 
+@functools.lru_cache(maxsize=1)
+def _get_interfaces() -> Tuple[str, ...]:
+    # network interface names, looked up once per process. call
+    # `_get_interfaces.cache_clear()` to pick up interfaces added since.
+    # if_nameindex() is missing or can fail on some platforms (e.x. older
+    # Windows builds); offer no specific interfaces there
+    try:
+        return tuple(name for ind,name in socket.if_nameindex())
+    except (AttributeError, OSError):
+        return ()
+
 class NoOpLogger:
+    __slots__ = ('buf',)
     def __init__(self):        self.buf  = ''
     def write(self, msg: str): self.buf += msg
     def flush(self): pass
@@ -34,7 +52,7 @@ class ControllerGUI:
         self.root = tk.Tk()
         self.client = Client()
         self.server = Server()
-        self.available_interfaces = ["(Don't bind to specific interface)"] + [name for ind,name in socket.if_nameindex()]
+        self.available_interfaces = ["(Don't bind to specific interface)", *_get_interfaces()]
         # status vars
         self.client_status_var = tk.StringVar()
         self.server_status_var = tk.StringVar()
@@ -46,6 +64,11 @@ class ControllerGUI:
         # server settings vars
         self.server_server_interface_var = tk.StringVar()
         self.server_server_port_var = tk.StringVar()
+        # latest state reported from the network threads, waiting for the Tk
+        # main loop to show it. None when nothing is pending
+        self._pending_state_lock = threading.Lock()
+        self._pending_client_state: Optional[int] = None
+        self._pending_server_state: Optional[bool] = None
     
     # def _set_client_address(self, text: str):
     #     try:
@@ -154,11 +177,27 @@ class ControllerGUI:
         else:
             self.server.logger.info("Stopped server\n")
     
+    # state callbacks run on client/server threads, but Tk may only be touched
+    # from the main loop, and a worker blocked on Tk could deadlock against a
+    # disconnect() joining it. so the callbacks only stash the newest state, and
+    # the main loop polls for it; transitions between polls are coalesced
     def _client_state_callback(self, transition: ClientStateTransition):
-        self.client_status_var.set(ClientState.get_name(transition.get_to()))
+        with self._pending_state_lock:
+            self._pending_client_state = transition.get_to()
     
     def _server_state_callback(self, from_state: bool, to_state: bool):
-        self.server_status_var.set("Running" if to_state else "Stopped")
+        with self._pending_state_lock:
+            self._pending_server_state = to_state
+    
+    def _poll_state(self):
+        try:
+            with self._pending_state_lock:
+                client_state, self._pending_client_state = self._pending_client_state, None
+                server_state, self._pending_server_state = self._pending_server_state, None
+            if client_state is not None: self.client_status_var.set(ClientState.get_name(client_state))
+            if server_state is not None: self.server_status_var.set("Running" if server_state else "Stopped")
+        finally:
+            self.root.after(STATE_POLL_INTERVAL_MS, self._poll_state)
     
     def _server_send(self, message: str):
         self.server.logger.debug(f"Callback received '{message}'\n")
@@ -192,8 +231,8 @@ class ControllerGUI:
         client_connection_frame.pack(**frame_spacing)
         
         # pack client frame
-        client_log_frame.pack(       **frame_spacing, expand=1)
-        self.client._subscribe_to_state_update(self._client_state_callback)
+        client_log_frame.pack(       **frame_spacing_expand)
+        self.client.subscribe('statechange', self._client_state_callback)
         
         # set up server frame
         server_log_frame, server_log_handler = make_log_frame(server_frame)
@@ -210,8 +249,9 @@ class ControllerGUI:
         
         # pack server frame
         #server_input_frame.pack(     **frame_spacing)
-        server_log_frame.pack(       **frame_spacing, expand=1)
+        server_log_frame.pack(       **frame_spacing_expand)
         self.server.subscribe_to_state_update(self._server_state_callback)
+        self.root.after(STATE_POLL_INTERVAL_MS, self._poll_state)
         
         # finalize and pack tabs
         client_frame.pack(expand=1, fill='both', padx=4, pady=4)
@@ -1,29 +1,62 @@
 import tkinter as tk
 from tkinter import ttk
 import logging
-import threading
 import collections
-import time
+
+# how often the Tk main loop drains queued log lines, in milliseconds. a burst
+# tends to keep coming, so poll faster right after anything was written
+DRAIN_INTERVAL_BUSY_MS = 5
+DRAIN_INTERVAL_IDLE_MS = 50
+# most lines written per drain; the rest wait a tick so the UI stays responsive
+DRAIN_BATCH_MAX = 500
+# bounds on memory for long sessions: lines waiting to be drained (oldest are
+# dropped first), and lines kept in the textbox
+MAX_QUEUED_MESSAGES = 10_000
+MAX_TEXTBOX_LINES = 5_000
 
 class ScrolledTextLogger(logging.Handler):
     def __init__(self, textbox: tk.scrolledtext.ScrolledText):
         super().__init__()
         self.__textbox = textbox
-        self.__thread = threading.Thread(name="ScrolledTextLogger", target=self.__mainloop, daemon=True)
-        self.__message_queue = collections.deque()
-    
-    def start(self): self.__thread.start()
+        self.__message_queue = collections.deque(maxlen=MAX_QUEUED_MESSAGES)
+        self.__dropped = 0
+
+    def start(self): self.__textbox.after(DRAIN_INTERVAL_IDLE_MS, self.__drain)
 
-    def __mainloop(self):
-        while True:
-            try: msg = self.__message_queue.popleft()
-            except IndexError: time.sleep(0.05)
-            else:
+    def __drain(self):
+        # runs on the Tk main loop; Tcl isn't thread-safe, so this is the only
+        # place the textbox is touched. emit() only appends to the deque
+        msgs = []
+        try:
+            queue = self.__message_queue
+            # records are formatted here rather than in emit(), so logging threads
+            # don't pay for it and records dropped from a full queue never are
+            for _ in range(min(len(queue), DRAIN_BATCH_MAX)):
+                record = queue.popleft()
+                try:
+                    msgs.append(self.format(record) + '\n')
+                except Exception:
+                    self.handleError(record)  # one bad record mustn't cost the rest
+            # emit() counts under the handler lock, so reset it under the same lock
+            if self.__dropped:
+                self.acquire()
+                dropped, self.__dropped = self.__dropped, 0
+                self.release()
+                msgs.insert(0, f"... {dropped} log message(s) dropped ...\n")
+            if msgs:
+                # one insert per tick, so a burst costs one redraw instead of one per line
                 self.__textbox.configure(state="normal")      # make field editable
-                self.__textbox.insert("end", msg)             # write text to textbox
+                self.__textbox.insert("end", ''.join(msgs))   # write text to textbox
+                lines = int(self.__textbox.index("end-1c").split('.')[0])
+                if lines > MAX_TEXTBOX_LINES:                 # trim oldest lines
+                    self.__textbox.delete("1.0", f"{lines - MAX_TEXTBOX_LINES + 1}.0")
                 self.__textbox.see("end")                     # scroll to end
                 self.__textbox.configure(state="disabled")    # make field readonly
+        finally:
+            # always reschedule, or the GUI log stops for good
+            self.__textbox.after(DRAIN_INTERVAL_BUSY_MS if msgs else DRAIN_INTERVAL_IDLE_MS, self.__drain)
 
     def emit(self, record: logging.LogRecord):
-        message = self.format(record) + '\n'
-        self.__message_queue.append(message)
+        # a full deque drops its oldest entry on append; keep count for the UI
+        if len(self.__message_queue) == MAX_QUEUED_MESSAGES:  self.__dropped += 1
+        self.__message_queue.append(record)
@@ -2,7 +2,14 @@
 # networking utility functions and classes
 # 
 
-from typing import Union
+import re
+import socket
+
+from typing import Optional
+
+# strict dotted-quad shape. inet_aton also accepts shorthand like '127.1', and
+# checking the shape first lets most bad input be rejected without raising
+_IPV4_RE = re.compile(r'(?:[0-9]{1,3}\.){3}[0-9]{1,3}')
 
 class IP:
     """
@@ -25,16 +32,17 @@ class IP:
         
         >>> int(ip)
         2130706433
+
+        >>> IP.try_from_str('not.an.ip.address') is None
+        True
     """
-    def __init__(self, arg: Union[int, str]):
-        if isinstance(int, arg):
-            self.__str = self.__class__.int_to_str(arg)
-            self.__int = arg
-        elif isinstance(str, arg):
-            self.__str = arg
-            self.__int = self.__class__.str_to_int(arg)
-        else:
-            raise ValueError("Argument is not a str nor int")
+    __slots__ = ('__str', '__int')
+
+    def __init__(self, ip_str: str, ip_int: int):
+        # both forms are passed in already computed; use from_str() / from_int()
+        # to build one from a single representation
+        self.__str = ip_str
+        self.__int = ip_int
     
     def __str__(self):
         return self.__str
@@ -52,22 +60,26 @@ class IP:
     @staticmethod
     def str_to_int(ip: str) -> int:
         """ Returns integer representation of x.x.x.x style IP address. """
-        p1,p2,p3,p4 = [int(p)&0xFF for p in ip.split('.')]
-        return (p1 << 24) | (p2 << 16) | (p3 << 8) | (p4)
+        # inet_aton does the parsing (and validation) in C; raises OSError
+        # if `ip` isn't a valid IPv4 address
+        return int.from_bytes(socket.inet_aton(ip), 'big')
 
     @staticmethod
     def int_to_str(dec: int) -> str:
         """ Returns x.x.x.x representation of integer-encoded IP address. """
-        p1 = (dec & 0xFF000000) >> 24
-        p2 = (dec & 0x00FF0000) >> 16
-        p3 = (dec & 0x0000FF00) >> 8
-        p4 = (dec & 0x000000FF)
-        return f"{p1}.{p2}.{p3}.{p4}"
+        return socket.inet_ntoa(dec.to_bytes(4, 'big'))
 
     @classmethod
-    def from_str(cls, ip: str):
+    def from_str(cls, ip: str) -> 'IP':
         return cls(ip, cls.str_to_int(ip))
     
     @classmethod
-    def from_int(cls, ip: int):
+    def from_int(cls, ip: int) -> 'IP':
         return cls(cls.int_to_str(ip), ip)
+
+    @classmethod
+    def try_from_str(cls, ip: str) -> Optional['IP']:
+        """ Like from_str(), but returns None for anything that isn't a dotted-quad IPv4 address. """
+        if _IPV4_RE.fullmatch(ip) is None:  return None
+        try: return cls.from_str(ip)
+        except OSError: return None  # right shape, but an octet is out of range
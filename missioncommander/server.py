@@ -2,8 +2,8 @@
 
 import threading
 import socket
+import selectors
 import collections
-import json
 
 from typing import List, SupportsInt, Callable, Dict
 
@@ -15,30 +15,30 @@ logging.getLogger('missioncommander.server')
 
 
 class ClientHandler(connection.ConnectionHandler):
+    __slots__ = ('__addr', '__server', '__client_id')
+
     def __init__(self, server, client_sock, client_addr):
         super().__init__(use_socket=client_sock)
         self.start()
         self.__addr = client_addr
         self.__server = server
-        # parse negotiation message
-        try:
-            msg = self.wait_for_recv(timeout=5.0)       # client sent a valid negotiation header...
-            if (msg is not None and                     #   and timeout did not expire...
-                msg.subject == 'negotiation' and        #     and it matches the right subject...
-                (id:=msg.payload['id'])                 #       and it has a valid payload...
-            ): self.__client_id = id; return            #         then set that payload as client_id.
-        except: pass
-        self.__client_id = None  # some error occurred or check failed. mark this ClientHandler as failed.
+        # parse negotiation message. the client must send a negotiation message
+        # before the timeout, carrying its ID as a non-empty string; otherwise
+        # client_id stays None and this ClientHandler is marked as failed
+        self.__client_id = None
+        msg = self.wait_for_recv(timeout=5.0)
+        if msg is None or msg.subject != connection.SUBJECT_NEGOTIATION:  return
+        payload = msg.payload
+        client_id = payload.get('id') if isinstance(payload, dict) else None
+        if isinstance(client_id, str) and client_id:
+            self.__client_id = client_id
+        else:
+            server.logger.debug("Negotiation from %s carried no usable client ID: %r", client_addr, client_id)
 
     @property
     def client_id(self):
         return self.__client_id
     
-    def reopen_with(self, sock: socket.socket, addr):
-        self.__addr = addr
-        self.sock = sock
-        self.start()
-    
     def __repr__(self) -> str:
         return f"<ClientHandler addr='{self.__addr}' id='{self.__client_id}'>"
 
@@ -51,9 +51,14 @@ class Server:
         self.__logger = logging.getLogger('missioncommander.server')
         # init socket
         self.__accept_socket: socket.socket = None
+        # the accept loop sleeps in select(); stop() wakes it through this pair
+        self.__selector: selectors.BaseSelector = None
+        self.__wakeup_recv: socket.socket = None
+        self.__wakeup_send: socket.socket = None
         # init server thread
-        self.__accept_thread = threading.Thread(target=self.__accept_loop, name="ServerMainThread")
+        self.__accept_thread: threading.Thread = None  # created by start(); threads can't be restarted
         self.__conns: Dict[str, ClientHandler] = {}
+        self.__conns_lock = threading.RLock()  # negotiation threads add to __conns concurrently
         # init status vars
         self.__status_callbacks: List[Callable] = []
         self.__should_run = False
@@ -113,61 +118,116 @@ class Server:
         # variables ok. make socket
         self.__accept_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.__accept_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.__accept_socket.settimeout(1.0)
+        self.__accept_socket.setblocking(False)  # select() does the waiting
         # bind to internal host
         self.__accept_socket.bind((self.__interface, self.__port))
         self.__accept_socket.listen(5)
+        self.__wakeup_recv, self.__wakeup_send = socket.socketpair()
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.__accept_socket, selectors.EVENT_READ)
+        self.__selector.register(self.__wakeup_recv, selectors.EVENT_READ)
         # start thread
         self.__set_should_run(True)
+        self.__accept_thread = threading.Thread(target=self.__accept_loop, name="ServerMainThread", daemon=True)
         self.__accept_thread.start()
         return True
     
     def stop(self) -> bool:
+        # nothing to stop (never started, or already stopped; the wakeup pair
+        # is closed once the accept loop exits)
+        if not self.__should_run:
+            self.__logger.error("Server is not running")
+            return False
         # stop thread
         self.__set_should_run(False)
+        try: self.__wakeup_send.send(b'\x00')
+        except OSError: pass  # (a full buffer already means a wakeup is pending)
         self.__accept_thread.join()
         # stop internal socket
         self.__accept_socket.close()  # TODO check for `None`
-        # close connections
-        for conn in self.__conns.values():
-            conn.send(connection.Message('shutdown', {}))
+        # close connections. take them all out under the lock, then close them
+        # outside it; stopped handlers shouldn't linger into the next start()
+        with self.__conns_lock:
+            conns = tuple(self.__conns.values())
+            self.__conns.clear()
+        for conn in conns:
+            conn.send(connection.Message(connection.SUBJECT_SHUTDOWN, {}))
             conn.stop()
         # all is well!
         return True
     
     def send(self, to: str, msg: connection.Message) -> bool:
+        # frame the message once, here, so every connection's thread reuses the
+        # cached bytes instead of racing to encode it, and so a bad payload is
+        # reported to the caller
+        try:
+            msg.to_wire()
+        except Exception as e:
+            self.logger.error("Could not pack message: %s", e)
+            return False
         # very basic right now. just send to all
-        if to == '*':
-            for conn in self.__conns.values():
-                conn.send(msg)
-        else:
-            if to not in self.__conns:
-                self.logger.error(f"Unknown client ID {to}")
-                return False
-            self.__conns[to].send(msg)
+        # snapshot under the lock so negotiation can't change the dict mid-loop,
+        # then queue outside it
+        with self.__conns_lock:
+            if to == '*':
+                targets = tuple(self.__conns.values())
+            elif to in self.__conns:
+                targets = (self.__conns[to],)
+            else:
+                targets = None
+        if targets is None:
+            self.logger.error(f"Unknown client ID {to}")
+            return False
+        for conn in targets:
+            conn.send(msg)
         return True
     
     def __negotiate_client_id(self, client_sock: socket.socket, client_addr):
+        # runs on its own thread, so nothing above would ever see an error
+        try:
+            self.__add_client(client_sock, client_addr)
+        except Exception as e:
+            self.__logger.error("Setting up connection to %s failed with error:", client_addr)
+            self.__logger.exception(e)
+    
+    def __add_client(self, client_sock: socket.socket, client_addr):
         client_sock.settimeout(1.0)
         client = ClientHandler(self, client_sock, client_addr)
         # did negotiation fail?
         if client.client_id is None:
             self.__logger.error(f"Connection to {client_addr} failed. Client did not complete negotiation before timeout or negotiation was malformed.")
             client.stop(blocking=False)
-        else:
-            self.__logger.warn("new connection: " + repr(client))
-            if client.client_id in self.__conns:
-                self.__logger.warn("... seen this connection before!")
+            return
+        self.__logger.warn("new connection: " + repr(client))
+        with self.__conns_lock:
+            if not self.__should_run:
+                # server stopped while this client was negotiating
                 client.stop(blocking=False)
-                self.__conns[client.client_id].reopen_with(client_sock, client_addr)
-            else:
-                self.__logger.warn("... this is new connection.")
-                self.__conns[client.client_id] = client
+                return
+            old = self.__conns.get(client.client_id)
+            self.__conns[client.client_id] = client
+        if old is None:
+            self.__logger.warn("... this is new connection.")
+        else:
+            # the client reconnected, so its old connection is dead or about to
+            # be. the new handler owns the new socket; just retire the old one
+            self.__logger.warn("... seen this connection before!")
+            old.stop()
     
     def __accept_loop(self):
         while self.__should_run:
-            try:
-                # accept outside connection
-                (client_sock, client_addr) = self.__accept_socket.accept()
-                self.__negotiate_client_id(client_sock, client_addr)
-            except socket.timeout: pass
+            # sleep until a client connects or stop() wakes us up
+            for key, _ in self.__selector.select():
+                if key.fileobj is self.__wakeup_recv:  continue  # loop condition handles it
+                try:
+                    # accept outside connection
+                    (client_sock, client_addr) = self.__accept_socket.accept()
+                except BlockingIOError: continue  # client went away before accept
+                # negotiation waits on the client, so don't hold up accept() for it
+                threading.Thread(
+                    target=self.__negotiate_client_id, args=(client_sock, client_addr),
+                    name="ServerNegotiation", daemon=True
+                ).start()
+        self.__selector.close()
+        self.__wakeup_recv.close()
+        self.__wakeup_send.close()